@@ -0,0 +1,120 @@
+/* Optional C helper for wordgrid.py.
+ *
+ * One pass over the raw bytes of the word list, doing the letter-count check
+ * and the rolling base-26 3-gram check together. The grid's 3-grams come in
+ * as a 17576-bit bitset (2197 bytes, fits in L1), so the gram test is one
+ * shift and one AND.
+ *
+ * Build in place with:  python setup.py build_ext --inplace
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+/* filter_words(data, grid_bitset, grid_letters) -> list of str
+ *
+ * data: the word list file as bytes, one word per line
+ * grid_bitset: 2197 bytes, bit g set iff 3-gram code g occurs in the grid
+ *              (code = (c0-'a')*676 + (c1-'a')*26 + (c2-'a'))
+ * grid_letters: 26 bytes with the grid's count per letter, 'a' first
+ *
+ * Keeps the words of more than 3 letters whose letters fit into the grid's
+ * counts and whose 3-grams all occur in the bitset.
+ */
+static PyObject *
+filter_words(PyObject *self, PyObject *args)
+{
+    Py_buffer data, bitset, letters;
+
+    if (!PyArg_ParseTuple(args, "y*y*y*", &data, &bitset, &letters))
+        return NULL;
+    if (bitset.len != 2197 || letters.len != 26) {
+        PyErr_SetString(PyExc_ValueError,
+                        "grid_bitset must be 2197 bytes and grid_letters 26 bytes");
+        goto error;
+    }
+
+    const uint8_t *buf = (const uint8_t *)data.buf;
+    const uint8_t *bs = (const uint8_t *)bitset.buf;
+    const uint8_t *gl = (const uint8_t *)letters.buf;
+    Py_ssize_t n = data.len;
+
+    PyObject *out = PyList_New(0);
+    if (out == NULL)
+        goto error;
+
+    Py_ssize_t pos = 0;
+    uint8_t wc[26];
+    while (pos < n) {
+        Py_ssize_t start = pos;
+        while (pos < n && buf[pos] != '\n')
+            pos++;
+        Py_ssize_t len = pos - start;
+        pos++;
+        if (len > 0 && buf[start + len - 1] == '\r')
+            len--;
+        if (len <= 3)
+            continue;
+
+        memset(wc, 0, sizeof(wc));
+        int ok = 1;
+        int code = 0;
+        for (Py_ssize_t i = 0; i < len; i++) {
+            int c = buf[start + i] - 'a';
+            if (c < 0 || c > 25) {
+                ok = 0;
+                break;
+            }
+            if (++wc[c] > gl[c]) {
+                ok = 0;
+                break;
+            }
+            code = (code % 676) * 26 + c;
+            if (i >= 2 && !(bs[code >> 3] & (1 << (code & 7)))) {
+                ok = 0;
+                break;
+            }
+        }
+        if (ok) {
+            PyObject *word = PyUnicode_FromStringAndSize((const char *)buf + start, len);
+            if (word == NULL || PyList_Append(out, word) < 0) {
+                Py_XDECREF(word);
+                Py_DECREF(out);
+                goto error;
+            }
+            Py_DECREF(word);
+        }
+    }
+
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&bitset);
+    PyBuffer_Release(&letters);
+    return out;
+
+error:
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&bitset);
+    PyBuffer_Release(&letters);
+    return NULL;
+}
+
+static PyMethodDef wordgrid_methods[] = {
+    {"filter_words", filter_words, METH_VARARGS,
+     "filter_words(data, grid_bitset, grid_letters) -> list of words"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef wordgrid_module = {
+    PyModuleDef_HEAD_INIT,
+    "_wordgrid",
+    "C helper doing the word list filtering in one pass.",
+    -1,
+    wordgrid_methods
+};
+
+PyMODINIT_FUNC
+PyInit__wordgrid(void)
+{
+    return PyModule_Create(&wordgrid_module);
+}
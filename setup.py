@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# builds the optional C helper: python setup.py build_ext --inplace
+from setuptools import setup, Extension
+
+setup(
+    name="wordgrid",
+    ext_modules=[
+        Extension("_wordgrid", ["_wordgrid.c"],
+                  extra_compile_args=["-O3", "-march=native"]),
+    ],
+)
@@ -27,48 +27,318 @@ https://github.com/AllenDowney/ThinkPython2/blob/master/code/words.txt
 If you play squaredle or huntedle, you will find that they are using different lists.
 You may miss some words, while they might not accept some of yours.
 
-Also, the script works with 3-letter sequences for words of at least 4 letters.
-It is possible that some word is suggested that is not possibly found in the grid, 
+The suggestions come from a trie built of the word list:
+the grid is walked cell by cell, following neighbour steps only,
+so every suggested word is really there in the grid
+(each cell used at most once, like the online games want it).
+
+The old 3-letter-sequence prefilter is still around in filter_wordlistfile,
+it is quicker to set up but may suggest words that are not actually in the grid,
 if the grid has letters appearing repeatedly, in different areas.
 
 
 """
+import mmap
+import os
+
 import numpy as np
-from collections import Counter
+
+# numba is optional - without it the search just runs as plain (slower) python
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+# the C helper is optional too (build it with: python setup.py build_ext --inplace)
+try:
+    import _wordgrid
+    HAVE_CEXT = True
+except ImportError:
+    HAVE_CEXT = False
 
 def is_letter_eng(char):
     return char.lower() in "abcdefghijklmnopqrstuvwxyz"
 
 
-# this is one possible way to check whether word has n-long substring
-def check_ngrams_in_word(word, ngramset, n):
-    for i in range(len(word)-n+1):
-        if word[i : i+n] not in ngramset:
-            return False
-    return True
+class TrieNode:
+    """One node of a trie (prefix tree) over the word list.
+    Each edge is labelled with a letter, and a node is marked
+    if the path from the root down to it spells out a whole word.
+    """
 
+    def __init__(self):
+        self.children = {}
+        self.is_word = False
 
-# will use this to exclude words containing letters occurring more times than in the grid
-def check_lettercount_in_word(word, lettercount):
-    lettercount_word = Counter(word)
-    for letter in lettercount_word:
-        if letter not in lettercount:
-            return False
-        else:
-            if lettercount_word[letter] > lettercount[letter]:
-                return False
-    return True
+    def insert(self, word):
+        node = self
+        for letter in word:
+            if letter not in node.children:
+                node.children[letter] = TrieNode()
+            node = node.children[letter]
+        node.is_word = True
+
+
+def read_wordlist_bytes(filename):
+    """Read the word list (1 word per line) by memory-mapping the file:
+    the bytes come straight from the page cache, no line-by-line IO layer,
+    no unicode decoding. Returns the words as a list of bytes.
+    """
+    with open(filename, "rb") as fin:
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].splitlines()
+
+
+def build_trie_from_wordlistfile(filename, minlength=4):
+    """Read the word list and build a trie of it.
+    Words shorter than minlength are left out, the games don't accept those anyway.
+    """
+    root = TrieNode()
+    for word in read_wordlist_bytes(filename):
+        if len(word) >= minlength:
+            root.insert(word.decode())
+    return root
+
+
+def flatten_trie(trie):
+    """Flatten the pointer-based trie into CSR-style int arrays, so the search
+    can run as compiled code on contiguous memory instead of chasing python
+    objects around.
+
+    Nodes get ids by breadth-first walk (root is 0). The children of node k
+    sit in the contiguous run col_letter[row_ptr[k]:row_ptr[k+1]] (letters as
+    0-25, sorted), with the target node ids alongside in col_child. A run is
+    at most 26 entries, so a child lookup is a short scan within a cache line
+    or two instead of a pointer chase per level.
+
+    Returns (row_ptr, col_letter, col_child, is_word, node_words), where
+    node_words maps node id to the word spelled out by that node (None for
+    non-word nodes).
+    """
+    nodes = []
+    queue = [(trie, "")]
+    while queue:
+        nextqueue = []
+        for node, sofar in queue:
+            node.flat_id = len(nodes)
+            nodes.append((node, sofar))
+            nextqueue.extend((child, sofar + letter)
+                             for letter, child in sorted(node.children.items()))
+        queue = nextqueue
+
+    row_ptr = np.empty(len(nodes) + 1, dtype=np.int32)
+    col_letter = []
+    col_child = []
+    is_word = np.empty(len(nodes), dtype=np.uint8)
+    node_words = []
+    for i, (node, sofar) in enumerate(nodes):
+        row_ptr[i] = len(col_letter)
+        for letter, child in sorted(node.children.items()):
+            col_letter.append(ord(letter) - ord("a"))
+            col_child.append(child.flat_id)
+        is_word[i] = 1 if node.is_word else 0
+        node_words.append(sofar if node.is_word else None)
+    row_ptr[len(nodes)] = len(col_letter)
+
+    return (row_ptr,
+            np.array(col_letter, dtype=np.int8),
+            np.array(col_child, dtype=np.int32),
+            is_word,
+            node_words)
+
+
+def load_flat_trie(filename, minlength=4):
+    """The flat trie arrays for a word list file, rebuilt only when needed.
+
+    Parsing the word list and flattening the trie dominate startup, so the
+    arrays are kept in a .npz next to the word list together with the list's
+    modification time and the minlength they were built with. While both are
+    unchanged, loading the cache back is a lot faster than reparsing; the
+    first run pays the build once.
+    """
+    cachefile = filename + ".cache.npz"
+    mtime = os.path.getmtime(filename)
+    if os.path.exists(cachefile):
+        cached = np.load(cachefile)
+        # caches from before minlength was stored just get rebuilt
+        if ("minlength" in cached and cached["mtime"] == mtime
+                and cached["minlength"] == minlength):
+            # node_words stored as the word nodes' ids plus their words
+            node_words = [None] * len(cached["is_word"])
+            for i, word in zip(cached["word_ids"], cached["word_list"]):
+                node_words[i] = str(word)
+            return (cached["row_ptr"], cached["col_letter"],
+                    cached["col_child"], cached["is_word"], node_words)
+
+    flat_trie = flatten_trie(build_trie_from_wordlistfile(filename, minlength))
+    row_ptr, col_letter, col_child, is_word, node_words = flat_trie
+    word_ids = np.array([i for i, word in enumerate(node_words) if word is not None],
+                        dtype=np.int32)
+    np.savez(cachefile, mtime=mtime, minlength=minlength, row_ptr=row_ptr,
+             col_letter=col_letter, col_child=col_child, is_word=is_word,
+             word_ids=word_ids,
+             word_list=np.array([node_words[i] for i in word_ids]))
+    return flat_trie
+
+
+@njit(cache=True)
+def _find_child(node, letter, row_ptr, col_letter, col_child):
+    # the children sit in one sorted run, a short scan finds the letter (or not)
+    for e in range(row_ptr[node], row_ptr[node + 1]):
+        if col_letter[e] == letter:
+            return col_child[e]
+        if col_letter[e] > letter:
+            break
+    return -1
+
+
+@njit(cache=True)
+def _dfs_flat(startcell, grid_letters, neighbours, neighbour_count,
+              row_ptr, col_letter, col_child, is_word, found):
+    # iterative DFS with an explicit stack - a step is a few array reads,
+    # no call frame gets set up and torn down per visited cell
+    # a path can visit every cell at most once, so the cell count bounds both
+    # the stack depth and the visited flags (one byte per cell, any grid size)
+    cells = grid_letters.shape[0]
+    cell_stack = np.empty(cells, dtype=np.int32)
+    node_stack = np.empty(cells, dtype=np.int32)
+    iter_stack = np.empty(cells, dtype=np.int32)
+    visited = np.zeros(cells, dtype=np.uint8)
+
+    node = _find_child(0, grid_letters[startcell], row_ptr, col_letter, col_child)
+    if node == -1:
+        return
+    if is_word[node]:
+        found[node] = 1
+    cell_stack[0] = startcell
+    node_stack[0] = node
+    iter_stack[0] = 0
+    visited[startcell] = 1
+    top = 0
+    while top >= 0:
+        cell = cell_stack[top]
+        k = iter_stack[top]
+        stepped = False
+        # find the next neighbour we can step to from the top of the stack
+        while k < neighbour_count[cell]:
+            nb = neighbours[cell, k]
+            k += 1
+            if visited[nb]:
+                continue
+            node = _find_child(node_stack[top], grid_letters[nb],
+                               row_ptr, col_letter, col_child)
+            if node == -1:
+                continue
+            iter_stack[top] = k
+            if is_word[node]:
+                found[node] = 1
+            top += 1
+            cell_stack[top] = nb
+            node_stack[top] = node
+            iter_stack[top] = 0
+            visited[nb] = 1
+            stepped = True
+            break
+        if not stepped:
+            # this path is exhausted, step back
+            visited[cell] = 0
+            top -= 1
+
+
+@njit(cache=True, parallel=True)
+def _search_all_cells(grid_letters, neighbours, neighbour_count,
+                      row_ptr, col_letter, col_child, is_word, found):
+    for cell in prange(grid_letters.shape[0]):
+        _dfs_flat(cell, grid_letters, neighbours, neighbour_count,
+                  row_ptr, col_letter, col_child, is_word, found)
+
+
+def find_words_flat(grid, flat_trie):
+    """Same search as find_words, but running on the flattened trie arrays
+    (compiled by numba when it is available).
+    """
+    row_ptr, col_letter, col_child, is_word, node_words = flat_trie
+    cells = grid.rows * grid.cols
+    grid_letters = np.empty(cells, dtype=np.uint8)
+    # cell indices, so wider than a byte - grids can go beyond 128 cells
+    neighbours = np.full((cells, 8), -1, dtype=np.int16)
+    neighbour_count = np.zeros(cells, dtype=np.int8)
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            cell = row * grid.cols + col
+            code = grid.get_element(row, col)
+            # gaps (and anything non-letter) get a sentinel that can never
+            # match a trie edge, so the search just never enters those cells
+            grid_letters[cell] = code - 97 if 97 <= code <= 122 else 255
+            for nextrow, nextcol in grid.get_neighbours_index(row, col):
+                neighbours[cell, neighbour_count[cell]] = nextrow * grid.cols + nextcol
+                neighbour_count[cell] += 1
+    found = np.zeros(len(is_word), dtype=np.uint8)
+    _search_all_cells(grid_letters, neighbours, neighbour_count,
+                      row_ptr, col_letter, col_child, is_word, found)
+    return sorted(node_words[i] for i in np.flatnonzero(found))
+
+
+# warm up the jit compilation right away, so the cost doesn't hit at the first
+# real search - on a dummy 2-cell grid ("ab") with a trie holding just "ab",
+# so the compiled search really takes a step and finds a word: if the compiled
+# code is broken, it blows up here at import and not at the first real grid
+if HAVE_NUMBA:
+    _warmup_found = np.zeros(3, dtype=np.uint8)
+    _search_all_cells(np.array([0, 1], dtype=np.uint8),
+                      np.array([[1, -1, -1, -1, -1, -1, -1, -1],
+                                [0, -1, -1, -1, -1, -1, -1, -1]], dtype=np.int16),
+                      np.array([1, 1], dtype=np.int8),
+                      np.array([0, 1, 2, 2], dtype=np.int32),
+                      np.array([0, 1], dtype=np.int8),
+                      np.array([1, 2], dtype=np.int32),
+                      np.array([0, 0, 1], dtype=np.uint8),
+                      _warmup_found)
+    assert _warmup_found[2] == 1, "compiled grid search gave a wrong result on the warm-up grid"
+    del _warmup_found
+
+
+def find_words(grid, trie):
+    """Walk the grid from every cell, following neighbour steps and trie edges
+    at the same time, and collect every word of the trie that can be walked.
+
+    A cell may be used only once per word, so the visited cells are tracked
+    in an int used as a bitmask (1 bit per cell) - no set to allocate per step.
+    """
+    found = set()
+
+    def dfs(row, col, visited, node, sofar):
+        bit = 1 << (row * grid.cols + col)
+        letter = chr(grid.get_element(row, col))
+        nextnode = node.children.get(letter)
+        if nextnode is None:
+            return
+        visited |= bit
+        sofar += letter
+        if nextnode.is_word:
+            found.add(sofar)
+        for nextrow, nextcol in grid.get_neighbours_index(row, col):
+            if not visited & (1 << (nextrow * grid.cols + nextcol)):
+                dfs(nextrow, nextcol, visited, nextnode, sofar)
+
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            dfs(row, col, 0, trie, "")
+    return sorted(found)
+
+
+# the ending for each last digit - only the teens fall outside the pattern
+_ORDINAL_ENDINGS = ("th", "st", "nd", "rd", "th", "th", "th", "th", "th", "th")
 
 
 def ordinalending(n):
-    suff = "th"
-    if (n % 10 == 1 and n % 100 != 11):
-        suff = "st"
-    if (n % 10 == 2 and n % 100 != 12):
-        suff = "nd"
-    if (n % 10 == 3 and n % 100 != 13):
-        suff = "rd"
-    return suff
+    return "th" if 10 <= n % 100 <= 13 else _ORDINAL_ENDINGS[n % 10]
 
 
 def read_posint_from_cmdline_withct(text, maxct, defvalue):
@@ -118,14 +388,36 @@ class WordGrid:
     """A grid of letters.
     Shape is 4x4 by default, but could be any of size.
     """
-    
+
+    # the 8 step offsets to the neighbouring slots, same for every grid
+    _OFFSETS = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if (i, j) != (0, 0))
+
     def __init__(self, m=4, n=4):
-        self.grid = np.empty(shape=(n, n), dtype=str)
+        # the letters live as ascii codes in a flat bytearray (slot (r,c) is at
+        # r*cols+c) - a 16-cell grid simply doesn't need numpy, and fetching an
+        # element gives a plain int without any per-op numpy overhead
+        self.grid = bytearray(m * n)
         self.rows = m
         self.cols = n
+        # lettercount / get_all_threegrams results are cached together with the
+        # grid version they were computed for; every update_* bumps the version,
+        # which makes the cached results stale
+        self._version = 0
+        self._cached_lettercount = (None, -1)
+        self._cached_threegrams = (None, -1)
+        # neighbour lists only depend on the shape of the grid, not the letters,
+        # so build them once here and just look them up later (key is row*cols+col)
+        self._neighbours = []
+        for row in range(m):
+            for col in range(n):
+                # bounds check inlined, no method call per offset
+                self._neighbours.append([(row+i, col+j) for i, j in self._OFFSETS
+                                         if 0 <= row+i < m and 0 <= col+j < n])
 
     def __str__(self):
-        return str(self.grid).upper()
+        return "\n".join(" ".join(chr(code).upper() if code else " "
+                                  for code in self.grid[row * self.cols:(row + 1) * self.cols])
+                         for row in range(self.rows))
 
     # delegating checking validity of given index to this function
     def is_valid_index(self, row, col):
@@ -135,77 +427,87 @@ class WordGrid:
     
     def update_grid_onefield(self, row, col, letter):
         try:
-            self.grid[row, col] = letter
+            self.grid[row * self.cols + col] = ord(letter.lower())
+            self._version += 1
         except:
             print("it should be 1 letter")
 
     def update_gridline_from_string(self, row, string):
-        if len(string) == self.rows:
-            self.grid[row, :] = list(string)
+        # check the encoded bytes, not the string: a non-ascii letter encodes
+        # to more than one byte, and a wrong-sized slice assignment would
+        # silently resize the bytearray and misalign the whole grid
+        encoded = string.lower().encode()
+        if len(encoded) == self.cols:
+            self.grid[row * self.cols:(row + 1) * self.cols] = encoded
+            self._version += 1
         else:
             print("Your string of letters doesn't really fit into the grid")
-    
+
     def update_gridline_from_list(self, row, lst):
-        if len(lst) == self.rows:
-            self.grid[row, :] = lst
+        encoded = "".join(lst).lower().encode()
+        if len(encoded) == self.cols:
+            self.grid[row * self.cols:(row + 1) * self.cols] = encoded
+            self._version += 1
         else:
             print("Your list of letters doesn't really fit into the grid")
-    
+
     def get_element(self, row, col):
-        return self.grid[row, col]
-    
+        # ascii code of the letter, as an int
+        return self.grid[row * self.cols + col]
+
     def lettercount(self):
-        """Returns a Counter object with the count for each letter occurring in the grid
+        """Returns a length-26 list ('a' first) with the count for each letter in the grid
+        (gaps and anything non-letter are simply not counted)
         """
-        return Counter(self.grid.flatten())
+        counts, version = self._cached_lettercount
+        if version == self._version:
+            return counts
+        counts = [0] * 26
+        for code in self.grid:
+            if 97 <= code <= 122:
+                counts[code - 97] += 1
+        self._cached_lettercount = (counts, self._version)
+        return counts
     
     def get_neighbours_index(self, row, col):
         """will return a list of index (row, col) pairs of all the neighbouring slots."""
         # every slot has 3, 5 or 8 neighbours (depending on position in the grid (edge/middle))
-        neighbours = []
-        for i in (-1, 0, 1):
-            for j in (-1, 0, 1):
-                if self.is_valid_index(row+i, col+j) and not (i == 0 and j == 0):
-                    neighbours.append((row+i, col+j))
-        return neighbours
+        # these were computed once in __init__, here we just look them up
+        return self._neighbours[row * self.cols + col]
 
       
     def get_two_neighbours(self, row, col):
-        """Get the neighbours of a given slot, and also the neighbours of the neighbours,
-        i.e. letter 3-grams (stepping back to original slot is not allowed)
+        """Yield the 3-grams starting at a given slot: the slot's letter plus a
+        neighbour's plus a neighbour-of-the-neighbour's (stepping back to the
+        original slot is not allowed).
+
+        Duplicates may come out (same 3-gram in different directions), the
+        deduplication is left to the caller - this way one grid-wide set is
+        enough instead of a little set per slot.
         """
-        # neighbour paths with 2 steps, stored in a dict
-        # dict keys: all the possible neighbours the starting point has
-        # dict elements: a list of neighbours for the given neighbour (excluding the start)
-        neighbour_dict = {}
-        neighbours = self.get_neighbours_index(row, col)
-        for neighbour in neighbours:
-            neighbour_dict[neighbour] = []
-            nextrow, nextcol = neighbour
-            nextneighbours = self.get_neighbours_index(nextrow, nextcol)
-            for nextneighbour in nextneighbours:
-                if nextneighbour != (row, col):
-                    neighbour_dict[neighbour].append(nextneighbour)
-        
-        threegrams = []
-        for key, itemlist in neighbour_dict.items():
-            keyrow, keycol = key
-            gram = self.get_element(row, col) + self.get_element(keyrow, keycol)
-            
-            for item in itemlist:
-                itemrow, itemcol = item
-                threegrams.append(gram+self.get_element(itemrow, itemcol))
-        # same 3-gram may occur in different directions, so converting to set
-        return set(threegrams)
-            
+        # neighbour paths with 2 steps, straight off the precomputed tables -
+        # no dict of lists to build and throw away per slot
+        # the first letter never changes and the second only per neighbour,
+        # so fetch each exactly once instead of again for every path
+        first = self.get_element(row, col)
+        for keyrow, keycol in self._neighbours[row * self.cols + col]:
+            second = self.get_element(keyrow, keycol)
+            for itemrow, itemcol in self._neighbours[keyrow * self.cols + keycol]:
+                if (itemrow, itemcol) != (row, col):
+                    # the elements are ascii codes, so a 3-gram is a little bytes object
+                    yield bytes((first, second, self.get_element(itemrow, itemcol)))
+
     def get_all_threegrams(self):
-        allgrams = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                grams = self.get_two_neighbours(row, col)
-                allgrams.extend(grams)
-        #allgrams_set = set(allgrams)
-        return set(allgrams)
+        allgrams, version = self._cached_threegrams
+        if version == self._version:
+            return allgrams
+        # one set for the whole grid, filled straight from the generators
+        allgrams = set(gram
+                       for row in range(self.rows)
+                       for col in range(self.cols)
+                       for gram in self.get_two_neighbours(row, col))
+        self._cached_threegrams = (allgrams, self._version)
+        return allgrams
 
 
 # some grid-related functions
@@ -242,16 +544,106 @@ def create_grid_from_cmdline():
     return grid
     
 
+# one-time preprocessing for the prefilter: all the words packed into one
+# letter matrix, so a grid query is numpy reductions instead of a python loop
+def build_wordlist_index(filename, minlength=4):
+    """Read the word list once and turn it into arrays reusable across grids.
+
+    Returns (words, letters, lengths, bitsets):
+      words: the words themselves, as bytes
+      letters: (N, maxlen) uint8 array of the words' ascii codes,
+               rows padded out with 'a' beyond each word's own length
+      lengths: (N,) int32 array with the words' lengths
+      bitsets: (N, 2197) uint8 array, row i has bit g set iff base-26
+               3-gram code g occurs in word i (17576 bits per word)
+    """
+    words = [w for w in read_wordlist_bytes(filename) if len(w) >= minlength]
+    maxlen = max(len(w) for w in words)
+    letters = np.full((len(words), maxlen), ord("a"), dtype=np.uint8)
+    lengths = np.empty(len(words), dtype=np.int32)
+    bitsets = np.zeros((len(words), 2197), dtype=np.uint8)
+    for i, w in enumerate(words):
+        letters[i, :len(w)] = np.frombuffer(w, dtype=np.uint8)
+        lengths[i] = len(w)
+        for j in range(len(w) - 2):
+            code = (w[j] - 97) * 676 + (w[j+1] - 97) * 26 + (w[j+2] - 97)
+            bitsets[i, code >> 3] |= 1 << (code & 7)
+    return words, letters, lengths, bitsets
+
+
+def filter_wordlist_index(index, grid):
+    """The prefilter run against a preprocessed word list index, as whole-matrix
+    numpy reductions: keeps every word whose letters fit into the grid's letter
+    counts and all of whose 3-grams occur somewhere in the grid.
+    """
+    words, letters, lengths, bitsets = index
+    maxlen = letters.shape[1]
+    # letter-count check for all words at once (the 'a' padding counted off again)
+    counts = (letters[:, :, None] == np.arange(97, 123, dtype=np.uint8)).sum(axis=1)
+    counts[:, 0] -= maxlen - lengths
+    ok = (counts <= grid.lettercount()).all(axis=1)
+    # 3-gram check: a word fits iff it needs no gram outside the grid's bitset,
+    # i.e. word_bits & ~grid_bits leaves nothing - one branchless AND-reduce
+    # over 2197 bytes per word
+    grid_bitset = np.zeros(2197, dtype=np.uint8)
+    for g in grid.get_all_threegrams():
+        if g.isalpha():
+            code = (g[0] - 97) * 676 + (g[1] - 97) * 26 + (g[2] - 97)
+            grid_bitset[code >> 3] |= 1 << (code & 7)
+    ok &= ~(bitsets & ~grid_bitset).any(axis=1)
+    return [words[i].decode() for i in np.flatnonzero(ok)]
+
+
+def filter_wordlistfile_cext(filename, grid):
+    """The prefilter done by the C helper: one pass over the raw bytes of the
+    word list, letter counts and 3-grams checked together against a 2197-byte
+    bitset of the grid's 3-gram codes.
+    """
+    grid_bitset = bytearray(2197)
+    for g in grid.get_all_threegrams():
+        if g.isalpha():
+            code = (g[0] - 97) * 676 + (g[1] - 97) * 26 + (g[2] - 97)
+            grid_bitset[code >> 3] |= 1 << (code & 7)
+    grid_letters = np.minimum(grid.lettercount(), 255).astype(np.uint8).tobytes()
+    # the mmap goes into the C function as a buffer, no copy of the file at all
+    with open(filename, "rb") as fin:
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _wordgrid.filter_words(mm, bytes(grid_bitset), grid_letters)
+
+
+# the quick-but-sloppy alternative to the trie walk:
+# keeps every word whose 3-letter sequences all occur somewhere in the grid
 def filter_wordlistfile(filename, grid):
     lettercount = grid.lettercount()
-    threegrams = grid.get_all_threegrams()
+    # the grid 3-grams coded as base-26 ints ('abc' -> a*676 + b*26 + c),
+    # integer set lookups are cheaper than hashing little strings
+    # (grams touching a gap are dropped - their codes would alias real ones)
+    grams = frozenset((g[0] - 97) * 676 + (g[1] - 97) * 26 + (g[2] - 97)
+                      for g in grid.get_all_threegrams() if g.isalpha())
     possible_words = []
-    fin = open(filename, "r")
-    for line in fin:
-        word = line.strip()
-        if (len(word) > 3 and check_lettercount_in_word(word, lettercount)):
-            if check_ngrams_in_word(word, threegrams, 3):
-                possible_words.append(word)
+    # one reusable 26-byte histogram, zeroed per word with a memset-style slice
+    wc = bytearray(26)
+    # the words stay bytes all the way, splitlines also saves the strip-per-line
+    for word in read_wordlist_bytes(filename):
+        if len(word) <= 3:
+            continue
+        # letter counts and the rolling 3-gram code checked in the same pass
+        # over the word, bailing out at the first failure of either
+        # (same fused loop the C helper runs)
+        wc[:] = b"\x00" * 26
+        code = 0
+        for i, b in enumerate(word):
+            k = b - 97
+            if k < 0 or k > 25:
+                break
+            wc[k] += 1
+            if wc[k] > lettercount[k]:
+                break
+            code = (code % 676) * 26 + k
+            if i >= 2 and code not in grams:
+                break
+        else:
+            possible_words.append(word.decode())
     return possible_words
 
 
@@ -266,7 +658,10 @@ grid = create_grid_from_cmdline()
 
 print("\nYour grid looks like:\n", grid, "\n")
 
-poss_words = filter_wordlistfile("words.txt", grid)
+if HAVE_NUMBA:
+    poss_words = find_words_flat(grid, load_flat_trie("words.txt"))
+else:
+    poss_words = find_words(grid, build_trie_from_wordlistfile("words.txt"))
 if len(poss_words) == 0:
     print("oh, can't seem to find any good words :o")
 else: